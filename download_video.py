@@ -13,142 +13,476 @@ Usage:
 
 If automatic extraction fails, follow the manual steps printed by the script
 to extract the video URL from your browser's developer tools.
+
+Video URLs extracted from a page are cached in ~/.cache/brownstone (or
+$XDG_CACHE_HOME/brownstone) and reused while the page is unchanged. Delete
+that directory to force a fresh extraction.
 """
 
+import collections
+import functools
+import hashlib
+import importlib.util
+import json
 import subprocess
 import sys
 import os
 import re
-from urllib.parse import urljoin, urlparse
-
+import shutil
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlparse, urlsplit
+
+
+# Browser-like headers sent with every request
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.5",
+}
+
+# Extraction cache entry format; bump whenever extract_video_urls() output
+# changes so entries from older versions are ignored
+_CACHE_VERSION = 1
+
+# Shared requests session, created by get_session()
+_SESSION = None
+
+# HTML parser for find_media_elements(), imported by _load_html_parser()
+_LexborHTMLParser = None
+_BeautifulSoup = None
+
+# yt-dlp output lines worth showing to the user
+_YT_DLP_MARKERS = ("Destination:", "Merging", "has already been downloaded")
+# ...when working in a temporary directory, whose paths aren't worth showing
+_YT_DLP_MOVED_MARKERS = ("has already been downloaded", "Saved:")
+
+# Serializes output from parallel download attempts
+_PRINT_LOCK = threading.Lock()
+
+# Set once ensure_dependencies() has checked every package
+_DEPS_READY = False
+
+# Video file extensions (at the end of the path) and known video services
+_DIRECT_URL_RE = re.compile(
+    r'\.(?:mp4|webm|m3u8|mov|avi|mkv|flv)(?:[?#]|$)'
+    r'|wistia\.(?:com|net)|vimeo\.com|youtu(?:be\.com|\.be)'
+    r'|vidyard\.com|brightcove|jwplatform|loom\.com|sproutvideo',
+    re.IGNORECASE
+)
+
+# Pages shorter than this are likely JavaScript single-page app shells
+_SPA_MAX_LENGTH = 5000
+
+# Tags searched by the DOM-based methods
+_MEDIA_TAG_RE = re.compile(r'<(?:video|iframe)\b', re.IGNORECASE)
+
+# Known video hosts for iframe embeds
+_IFRAME_HOST_RE = re.compile(r'vimeo|youtube|wistia|vidyard|brightcove|loom', re.IGNORECASE)
+
+# Regex detection methods 3-6, fused into one alternation so the HTML is
+# scanned in a single pass. Each named group captures a video ID (or the full
+# URL for direct files) and maps to its (source type, URL template).
+_REGEX_SOURCES = {
+    # Method 3: Wistia embeds (common on marketing pages)
+    "wistia_async": ("wistia", "https://fast.wistia.net/embed/iframe/{}"),
+    "wistia_embed": ("wistia", "https://fast.wistia.net/embed/iframe/{}"),
+    "wistia_hashed": ("wistia", "https://fast.wistia.net/embed/iframe/{}"),
+    # Method 4: Vimeo embeds
+    "vimeo_player": ("vimeo", "https://player.vimeo.com/video/{}"),
+    "vimeo_page": ("vimeo", "https://player.vimeo.com/video/{}"),
+    # Method 5: YouTube embeds
+    "youtube_embed": ("youtube", "https://www.youtube.com/watch?v={}"),
+    "youtube_watch": ("youtube", "https://www.youtube.com/watch?v={}"),
+    "youtube_short": ("youtube", "https://www.youtube.com/watch?v={}"),
+    # Method 6: Direct video file URLs in HTML/JS
+    "direct_file": ("direct_file", "{}"),
+}
+
+# A URL character that doesn't begin another "http(s)://". The path of a
+# direct file URL stops at the next scheme, so each URL start scans only up
+# to the next one and backtracking stays linear on long runs of URL-like
+# text. The query string after the extension is taken whole, so signed URLs
+# such as "v.mp4?ref=https://site/&sig=abc" are kept intact.
+_URL_CHAR = r'(?:[^\s"\'<>h]|h(?!ttps?://))'
+
+_EMBED_PATTERNS = (
+    r'wistia_async_(?P<wistia_async>[a-zA-Z0-9]+)',
+    r'//fast\.wistia\.(?:com|net)/embed/(?:iframe|medias)/(?P<wistia_embed>[a-zA-Z0-9]+)',
+    r'"hashedId"\s*:\s*"(?P<wistia_hashed>[a-zA-Z0-9]+)"',
+    r'player\.vimeo\.com/video/(?P<vimeo_player>\d+)',
+    r'vimeo\.com/(?P<vimeo_page>\d+)',
+    r'youtube\.com/embed/(?P<youtube_embed>[a-zA-Z0-9_-]+)',
+    r'youtube\.com/watch\?v=(?P<youtube_watch>[a-zA-Z0-9_-]+)',
+    r'youtu\.be/(?P<youtube_short>[a-zA-Z0-9_-]+)',
+)
+
+# Embeds only, for finding IDs inside an already matched direct file URL
+_EMBED_RE = re.compile("|".join(_EMBED_PATTERNS))
+
+_VIDEO_RE = re.compile("|".join(_EMBED_PATTERNS + (
+    r'(?P<direct_file>(?i:https?://' + _URL_CHAR + r'+\.(?:mp4|m3u8|webm)'
+    r'(?:\?[^\s"\'<>]*)?))',
+)))
+
+# JSON/JS-escaped forward slashes in direct file URLs
+_UNESCAPE_SLASH_RE = re.compile(r'\\u002F|\\/')
+
+# Regex sources in the order their results are reported
+_REGEX_SOURCE_ORDER = ("wistia", "vimeo", "youtube", "direct_file")
+
+# Characters kept between streamed chunks so matches spanning a chunk
+# boundary are not split (bounds the longest URL that can be found when it
+# spans one)
+_SCAN_OVERLAP = 4096
+
+# Direct downloads: read size and minimum seconds between progress updates
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+_PROGRESS_INTERVAL = 0.05
+
+
+def install_package(package, module=None):
+    """
+    Install a package if not already installed.
 
-def install_package(package):
-    """Install a package if not already installed."""
-    try:
-        __import__(package.replace("-", "_").split()[0])
-    except ImportError:
+    module is the import name to probe for (defaults to the package name with
+    dashes replaced). find_spec locates it without executing the module.
+    """
+    module = module or package.replace("-", "_").split()[0]
+    if importlib.util.find_spec(module) is None:
         print(f"Installing {package}...")
         subprocess.run(
             [sys.executable, "-m", "pip", "install", package],
             capture_output=True
         )
+        importlib.invalidate_caches()
 
 
 def ensure_dependencies():
-    """Ensure all required dependencies are installed."""
-    packages = ["requests", "beautifulsoup4", "yt-dlp"]
-    for pkg in packages:
-        install_package(pkg)
+    """Ensure all required dependencies are installed (checked once per process)."""
+    global _DEPS_READY
+    if _DEPS_READY:
+        return
+
+    packages = [
+        ("requests", "requests"),
+        ("beautifulsoup4", "bs4"),
+        ("selectolax", "selectolax"),
+        ("yt-dlp", "yt_dlp"),
+    ]
+    for pkg, module in packages:
+        install_package(pkg, module)
+    _DEPS_READY = True
 
 
 def is_direct_video_url(url):
     """Check if URL is a direct video file or known video service."""
-    video_extensions = [".mp4", ".webm", ".m3u8", ".mov", ".avi", ".mkv", ".flv"]
-    video_services = [
-        "wistia.com", "wistia.net", "vimeo.com", "youtube.com", "youtu.be",
-        "vidyard.com", "brightcove", "jwplatform", "loom.com", "sproutvideo"
-    ]
-
-    url_lower = url.lower()
-    if any(ext in url_lower for ext in video_extensions):
-        return True
-    if any(service in url_lower for service in video_services):
-        return True
-    return False
+    return bool(_DIRECT_URL_RE.search(url))
+
+
+def get_session():
+    """Return the shared requests session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.3),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
 
 
-def fetch_page(url):
-    """Fetch a page with browser-like headers."""
-    import requests
+def open_page(url, etag=None):
+    """
+    Request a page with browser-like headers, returning the streamed response.
 
+    If etag is given it is sent as If-None-Match, and the caller must handle
+    a 304 Not Modified response.
+    """
     headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        ),
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
     }
+    if etag:
+        headers["If-None-Match"] = etag
 
-    response = requests.get(url, headers=headers, timeout=30)
+    response = get_session().get(url, headers=headers, stream=True, timeout=30)
     response.raise_for_status()
-    return response.text
+    # iter_content only decodes when an encoding is known
+    response.encoding = response.encoding or "utf-8"
+    return response
 
 
-def extract_video_urls(html, base_url):
-    """Extract video URLs from HTML content using multiple detection methods."""
-    from bs4 import BeautifulSoup
+def iter_page(url, chunk_size=65536):
+    """Stream a page with browser-like headers, yielding decoded text chunks."""
+    with open_page(url) as response:
+        yield from response.iter_content(chunk_size=chunk_size, decode_unicode=True)
 
-    soup = BeautifulSoup(html, "html.parser")
-    video_urls = []
 
-    # Method 1: Direct video elements
-    for video in soup.find_all("video"):
-        src = video.get("src")
-        if src:
-            video_urls.append(("video_element", urljoin(base_url, src)))
-        for source in video.find_all("source"):
-            src = source.get("src")
-            if src:
-                video_urls.append(("video_source", urljoin(base_url, src)))
+def fetch_page(url):
+    """Fetch a page with browser-like headers."""
+    return "".join(iter_page(url))
 
-    # Method 2: Iframe embeds for known video hosts
-    for iframe in soup.find_all("iframe"):
-        src = iframe.get("src") or iframe.get("data-src")
-        if src:
-            video_hosts = ["vimeo", "youtube", "wistia", "vidyard", "brightcove", "loom"]
-            if any(host in src.lower() for host in video_hosts):
-                video_urls.append(("iframe_embed", src))
 
-    # Method 3: Wistia embeds (common on marketing pages)
-    wistia_patterns = [
-        r'wistia_async_([a-zA-Z0-9]+)',
-        r'//fast\.wistia\.(?:com|net)/embed/(?:iframe|medias)/([a-zA-Z0-9]+)',
-        r'"hashedId"\s*:\s*"([a-zA-Z0-9]+)"',
-    ]
-    for pattern in wistia_patterns:
-        for vid_id in set(re.findall(pattern, html)):
-            video_urls.append(("wistia", f"https://fast.wistia.net/embed/iframe/{vid_id}"))
+def fetch_and_scan(url, etag=None, chunk_size=65536):
+    """
+    Fetch a page while scanning it for embedded video URLs.
 
-    # Method 4: Vimeo embeds
-    vimeo_patterns = [r'player\.vimeo\.com/video/(\d+)', r'vimeo\.com/(\d+)']
-    for pattern in vimeo_patterns:
-        for vid_id in set(re.findall(pattern, html)):
-            video_urls.append(("vimeo", f"https://player.vimeo.com/video/{vid_id}"))
+    The regex scan runs on each chunk as it arrives, overlapping parsing with
+    the network transfer. Returns (html, regex_urls, etag) where regex_urls
+    can be passed on to extract_video_urls(). If the server answers 304 Not
+    Modified to the given etag, html and regex_urls are None.
+    """
+    chunks = []
 
-    # Method 5: YouTube embeds
-    youtube_patterns = [
-        r'youtube\.com/embed/([a-zA-Z0-9_-]+)',
-        r'youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
-        r'youtu\.be/([a-zA-Z0-9_-]+)',
-    ]
-    for pattern in youtube_patterns:
-        for vid_id in set(re.findall(pattern, html)):
-            video_urls.append(("youtube", f"https://www.youtube.com/watch?v={vid_id}"))
+    with open_page(url, etag) as response:
+        if response.status_code == 304:
+            return None, None, etag
+
+        def tee():
+            for chunk in response.iter_content(chunk_size=chunk_size, decode_unicode=True):
+                chunks.append(chunk)
+                yield chunk
+
+        # Drop repeated hits as they stream in rather than keeping every match
+        regex_urls = list(dict.fromkeys(scan_video_urls(tee())))
+        return "".join(chunks), regex_urls, response.headers.get("ETag")
 
-    # Method 6: Direct video file URLs in HTML/JS
-    video_file_matches = re.findall(
-        r'(https?://[^\s"\'<>]+\.(?:mp4|m3u8|webm)(?:\?[^\s"\'<>]*)?)',
-        html,
-        re.IGNORECASE
-    )
-    for url in set(video_file_matches):
-        url = url.replace("\\u002F", "/").replace("\\/", "/")
-        video_urls.append(("direct_file", url))
 
-    # Deduplicate
-    seen = set()
-    unique_urls = []
-    for source_type, url in video_urls:
-        if url not in seen:
-            seen.add(url)
-            unique_urls.append((source_type, url))
+def _cache_path(url):
+    """Return the extraction cache file for a page URL."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_home, "brownstone", f"{key}.json")
 
-    return unique_urls
 
+def load_cached_extraction(url):
+    """
+    Return the cached {"version", "etag", "html_hash", "urls"} entry for url.
+
+    Returns None if there is no entry, or it is unreadable, malformed or was
+    written by a different _CACHE_VERSION.
+    """
+    try:
+        with open(_cache_path(url), encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        not isinstance(entry, dict)
+        or entry.get("version") != _CACHE_VERSION
+        or not isinstance(entry.get("etag"), (str, type(None)))
+        or not isinstance(entry.get("urls"), list)
+    ):
+        return None
+    # Each item must unpack to (source_type, url)
+    for item in entry["urls"]:
+        if not (
+            isinstance(item, list)
+            and len(item) == 2
+            and all(isinstance(part, str) for part in item)
+        ):
+            return None
+    return entry
+
+
+def save_cached_extraction(url, etag, html_hash, video_urls):
+    """Cache the URLs extracted from a page; failures are ignored."""
+    path = _cache_path(url)
+    entry = {
+        "version": _CACHE_VERSION,
+        "etag": etag,
+        "html_hash": html_hash,
+        "urls": video_urls,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+    except OSError:
+        pass
 
-def download_with_yt_dlp(video_url, output_dir, verbose=False):
-    """Download video using yt-dlp."""
+
+def _html_hash(html):
+    """Hash page content for comparison with a cached extraction."""
+    return hashlib.sha256(html.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _load_html_parser():
+    """Import the best available HTML parser on first use."""
+    global _LexborHTMLParser, _BeautifulSoup
+    if _LexborHTMLParser is not None or _BeautifulSoup is not None:
+        return
+
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+        _LexborHTMLParser = LexborHTMLParser
+        return
+    except ImportError:
+        pass
+
+    from bs4 import BeautifulSoup, FeatureNotFound
+
+    try:
+        BeautifulSoup("", "lxml")
+        features = "lxml"
+    except FeatureNotFound:
+        features = "html.parser"
+    _BeautifulSoup = functools.partial(BeautifulSoup, features=features)
+
+
+def find_media_elements(html):
+    """
+    Yield (tag, src) for <video>, <source> and <iframe> elements.
+
+    Uses selectolax's C-based lexbor parser when available, falling back to
+    BeautifulSoup with lxml (or the stdlib html.parser).
+    """
+    _load_html_parser()
+
+    if _LexborHTMLParser is not None:
+        tree = _LexborHTMLParser(html)
+        for video in tree.css("video"):
+            yield "video", video.attributes.get("src")
+            for source in video.css("source"):
+                yield "source", source.attributes.get("src")
+        for iframe in tree.css("iframe"):
+            yield "iframe", iframe.attributes.get("src") or iframe.attributes.get("data-src")
+        return
+
+    soup = _BeautifulSoup(html)
+    for video in soup.find_all("video"):
+        yield "video", video.get("src")
+        for source in video.find_all("source"):
+            yield "source", source.get("src")
+    for iframe in soup.find_all("iframe"):
+        yield "iframe", iframe.get("src") or iframe.get("data-src")
+
+
+def scan_video_urls(chunks):
+    """
+    Yield (source_type, url) for regex methods 3-6 over a stream of text chunks.
+
+    Matches ending within _SCAN_OVERLAP characters of a chunk's end, and any
+    text after them in that window, are held back and rescanned together
+    with the next chunk. A direct file URL is
+    reported once, from the last http(s):// before its extension, with its
+    full query string; embed IDs inside it are reported too.
+
+    >>> list(scan_video_urls(['"https://cdn.example/v.mp4?ref=https://site/&sig=abc"']))
+    [('direct_file', 'https://cdn.example/v.mp4?ref=https://site/&sig=abc')]
+    >>> list(scan_video_urls(["https://proxy/?u=https://cdn/v.mp4 "]))
+    [('direct_file', 'https://cdn/v.mp4')]
+    >>> list(scan_video_urls(['"https://cdn.example/youtu.be/abc', 'def.mp4"']))
+    [('direct_file', 'https://cdn.example/youtu.be/abcdef.mp4'), ('youtube', 'https://www.youtube.com/watch?v=abcdef')]
+    """
+    pending = ""
+    chunks = iter(chunks)
+    chunk = next(chunks, None)
+    while chunk is not None:
+        buf = pending + chunk
+        chunk = next(chunks, None)
+        limit = len(buf) - _SCAN_OVERLAP if chunk is not None else len(buf)
+        resume = 0
+        for match in _VIDEO_RE.finditer(buf):
+            if match.end() > limit:
+                # Never resume past limit: a direct file URL starting there
+                # may only fail because its extension hasn't arrived yet.
+                # Matches already longer than _SCAN_OVERLAP are dropped so a
+                # run that keeps growing isn't rescanned on every chunk.
+                resume = max(min(match.start(), limit), limit - _SCAN_OVERLAP, 0)
+                break
+            hits = [match]
+            if match.lastgroup == "direct_file":
+                # The file URL is consumed; embed IDs inside it are still reported
+                hits.extend(_EMBED_RE.finditer(match.group()))
+            for hit in hits:
+                source_type, template = _REGEX_SOURCES[hit.lastgroup]
+                url = template.format(hit.group(hit.lastgroup))
+                if source_type == "direct_file":
+                    url = _UNESCAPE_SLASH_RE.sub("/", url)
+                yield source_type, url
+            resume = match.end()
+        else:
+            resume = max(resume, limit)
+        pending = buf[resume:]
+
+
+def _join_url(base_url, base_scheme, src):
+    """urljoin() with shortcuts for absolute and protocol-relative URLs."""
+    if src.startswith(("http://", "https://")):
+        return src
+    if src.startswith("//"):
+        return f"{base_scheme}:{src}"
+    return urljoin(base_url, src)
+
+
+def extract_video_urls(html, base_url, regex_urls=None):
+    """
+    Extract video URLs from HTML content using multiple detection methods.
+
+    regex_urls may hold results already collected by scan_video_urls() (e.g.
+    from fetch_and_scan()) to avoid rescanning the HTML.
+    """
+    # Keyed by URL so duplicates keep the first source type seen
+    results = {}
+    base_scheme = urlsplit(base_url).scheme
+
+    # Methods 1-2 need a parsed DOM; skip it for SPA shells with no media tags
+    if len(html) < _SPA_MAX_LENGTH and not _MEDIA_TAG_RE.search(html):
+        media_elements = ()
+    else:
+        media_elements = find_media_elements(html)
+
+    for tag, src in media_elements:
+        if not src:
+            continue
+        # Method 1: Direct video elements
+        if tag == "video":
+            results.setdefault(_join_url(base_url, base_scheme, src), "video_element")
+        elif tag == "source":
+            results.setdefault(_join_url(base_url, base_scheme, src), "video_source")
+        # Method 2: Iframe embeds for known video hosts
+        elif _IFRAME_HOST_RE.search(src):
+            results.setdefault(src, "iframe_embed")
+
+    # Methods 3-6: Single regex pass over the raw HTML/JS
+    if regex_urls is None:
+        regex_urls = scan_video_urls((html,))
+    by_source = {source_type: {} for source_type in _REGEX_SOURCE_ORDER}
+    for source_type, url in regex_urls:
+        by_source[source_type].setdefault(url, source_type)
+    for urls in by_source.values():
+        for url, source_type in urls.items():
+            results.setdefault(url, source_type)
+
+    return [(source_type, url) for url, source_type in results.items()]
+
+
+def download_with_yt_dlp(video_url, output_dir, verbose=False, cancel_event=None,
+                         temp_dir=None):
+    """
+    Download video using yt-dlp.
+
+    If cancel_event is given and gets set, the yt-dlp process is killed and
+    the attempt counts as failed. If temp_dir is given, yt-dlp downloads
+    there and only moves the finished file into output_dir, never
+    overwriting an existing one.
+    """
     os.makedirs(output_dir, exist_ok=True)
 
     cmd = [
@@ -156,33 +490,126 @@ def download_with_yt_dlp(video_url, output_dir, verbose=False):
         "--no-check-certificate",
         "--legacy-server-connect",  # Help with SSL issues
         "--no-playlist",
-        "-o", os.path.join(output_dir, "%(title)s.%(ext)s"),
     ]
 
+    if temp_dir:
+        # Working files stay in temp_dir; yt-dlp still skips videos already
+        # in output_dir and reports the final path once the file is moved
+        cmd += [
+            "-P", f"home:{output_dir}",
+            "-P", f"temp:{os.path.abspath(temp_dir)}",
+            "-o", "%(title)s.%(ext)s",
+            "--no-overwrites",
+            "--print", "after_move:Saved: %(filepath)s",
+            "--no-quiet",
+        ]
+        markers = _YT_DLP_MOVED_MARKERS
+    else:
+        cmd += ["-o", os.path.join(output_dir, "%(title)s.%(ext)s")]
+        markers = _YT_DLP_MARKERS
+
     if verbose:
         cmd.append("--verbose")
 
     cmd.append(video_url)
 
-    print(f"  Attempting: {video_url[:70]}...")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if result.returncode == 0:
-        print("  SUCCESS!")
-        # Show destination file
-        for line in result.stdout.split("\n"):
-            if "Destination:" in line or "Merging" in line:
-                print(f"  {line.strip()}")
-            elif "has already been downloaded" in line:
-                print(f"  {line.strip()}")
+    _log(f"  Attempting: {video_url[:70]}...")
+    # A cancellable attempt gets its own process group so that cancelling
+    # also kills the ffmpeg children that share its stdout pipe
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1,
+        start_new_session=cancel_event is not None,
+    )
+    if cancel_event is not None:
+        threading.Thread(
+            target=_kill_on_cancel, args=(proc, cancel_event), daemon=True
+        ).start()
+
+    # Keep only the tail of the output for error reporting
+    tail = collections.deque(maxlen=200)
+    for line in proc.stdout:
+        tail.append(line)
+        # Show destination file as soon as yt-dlp reports it
+        if any(marker in line for marker in markers):
+            _log(f"  {line.strip()}")
+    proc.wait()
+
+    if cancel_event is not None and cancel_event.is_set():
+        return False
+    if proc.returncode == 0:
+        _log("  SUCCESS!")
         return True
+    errors = [line.strip() for line in tail if line.startswith("ERROR:")]
+    if errors:
+        _log(f"  {errors[-1][:120]}")
     return False
 
 
+def _log(message):
+    """Print a line without interleaving with other download threads."""
+    with _PRINT_LOCK:
+        print(message, flush=True)
+
+
+def _kill_on_cancel(proc, cancel_event):
+    """Kill proc and its process group if cancel_event is set before it exits."""
+    while proc.poll() is None:
+        if cancel_event.wait(0.5):
+            if hasattr(os, "killpg"):
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+            else:
+                proc.kill()
+            return
+
+
+def download_first_available(video_urls, output_dir, max_workers=4):
+    """
+    Try yt-dlp on several candidate URLs in parallel, keeping the first success.
+
+    Each attempt works in its own temporary directory under output_dir, and
+    yt-dlp moves the finished file into output_dir. The first attempt to
+    finish wins, which is not necessarily the highest-ranked candidate; the
+    remaining attempts are cancelled.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    done = threading.Event()
+
+    def attempt(vid_url):
+        if done.is_set():
+            return False
+        with tempfile.TemporaryDirectory(prefix=".attempt-", dir=output_dir) as tmp_dir:
+            if download_with_yt_dlp(vid_url, output_dir, cancel_event=done, temp_dir=tmp_dir):
+                done.set()
+                return True
+        return False
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(attempt, vid_url) for _, vid_url in video_urls]
+        try:
+            for future in as_completed(futures):
+                if future.result():
+                    for other in futures:
+                        other.cancel()
+                    return True
+        finally:
+            # Attempts run in their own sessions and miss the terminal's
+            # Ctrl+C, so stop them before the executor waits on them
+            done.set()
+    return False
+
+
+def _write_all(fd, data):
+    """Write all of data to a file descriptor, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
 def download_direct(video_url, output_dir):
     """Download video directly using requests."""
-    import requests
-
     os.makedirs(output_dir, exist_ok=True)
 
     parsed = urlparse(video_url)
@@ -195,23 +622,31 @@ def download_direct(video_url, output_dir):
     print(f"  Direct download to: {output_path}")
 
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        response = requests.get(video_url, headers=headers, stream=True, timeout=60)
+        response = get_session().get(video_url, stream=True, timeout=60)
         response.raise_for_status()
 
         total = int(response.headers.get("content-length", 0))
         downloaded = 0
-
-        with open(output_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-                downloaded += len(chunk)
-                if total:
-                    pct = (downloaded / total) * 100
-                    mb = downloaded / (1024 * 1024)
-                    print(f"\r  Progress: {pct:.1f}% ({mb:.1f} MB)", end="", flush=True)
+        last_progress = 0.0
+
+        with response, open(output_path, "wb") as f:
+            if not total or not sys.stdout.isatty():
+                # No progress bar to draw, so copy straight from the raw stream.
+                # (os.sendfile can't be used: the source is a socket, possibly
+                # TLS-wrapped, chunked or compressed.)
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, f, length=_DOWNLOAD_CHUNK_SIZE)
+            else:
+                fd = f.fileno()
+                for chunk in response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
+                    _write_all(fd, chunk)
+                    downloaded += len(chunk)
+                    now = time.monotonic()
+                    if now - last_progress >= _PROGRESS_INTERVAL or downloaded >= total:
+                        last_progress = now
+                        pct = (downloaded / total) * 100
+                        mb = downloaded / (1024 * 1024)
+                        print(f"\r  Progress: {pct:.1f}% ({mb:.1f} MB)", end="", flush=True)
 
         print(f"\n  SUCCESS: {output_path}")
         return True
@@ -296,33 +731,47 @@ def download_video(url, output_dir="./downloads"):
 
     # Fetch and parse the page
     print("\n[2/3] Fetching page content...")
+    cached = load_cached_extraction(url)
     try:
-        html = fetch_page(url)
-        print(f"  Fetched {len(html):,} bytes")
+        html, regex_urls, etag = fetch_and_scan(url, cached and cached.get("etag"))
     except Exception as e:
         print(f"  Error: {e}")
         print_manual_instructions(url)
         return False
 
-    # Check if it's a JavaScript SPA (minimal HTML content)
-    if len(html) < 5000 and "<script" in html:
-        print("  Page appears to be a JavaScript single-page application")
-        print("  Video content is loaded dynamically via JavaScript")
+    if html is None:
+        print("  Page not modified since last run")
+    else:
+        print(f"  Fetched {len(html):,} bytes")
+        # Check if it's a JavaScript SPA (minimal HTML content)
+        if len(html) < _SPA_MAX_LENGTH and "<script" in html:
+            print("  Page appears to be a JavaScript single-page application")
+            print("  Video content is loaded dynamically via JavaScript")
 
     # Extract video URLs
-    print("\n[3/3] Searching for video URLs in HTML...")
-    video_urls = extract_video_urls(html, url)
+    html_hash = _html_hash(html) if html is not None else None
+    if html is None or (cached and cached.get("html_hash") == html_hash):
+        print("\n[3/3] Using video URLs cached from last run...")
+        video_urls = [tuple(item) for item in cached["urls"]]
+    else:
+        print("\n[3/3] Searching for video URLs in HTML...")
+        video_urls = extract_video_urls(html, url, regex_urls)
+    if html is not None:
+        save_cached_extraction(url, etag, html_hash, video_urls)
 
     if video_urls:
         print(f"  Found {len(video_urls)} potential source(s)")
         for source_type, vid_url in video_urls:
-            print(f"\n  Trying [{source_type}]: {vid_url[:60]}...")
-            if download_with_yt_dlp(vid_url, output_dir):
-                print("\n" + "=" * 60)
-                print("VIDEO DOWNLOADED SUCCESSFULLY!")
-                print("=" * 60)
-                return True
+            print(f"    [{source_type}] {vid_url[:60]}...")
+        print("\n  Trying sources with yt-dlp...")
+        if download_first_available(video_urls, output_dir):
+            print("\n" + "=" * 60)
+            print("VIDEO DOWNLOADED SUCCESSFULLY!")
+            print("=" * 60)
+            return True
+        for source_type, vid_url in video_urls:
             if ".mp4" in vid_url.lower() or ".webm" in vid_url.lower():
+                print(f"\n  Trying [{source_type}]: {vid_url[:60]}...")
                 if download_direct(vid_url, output_dir):
                     print("\n" + "=" * 60)
                     print("VIDEO DOWNLOADED SUCCESSFULLY!")